@@ -16,6 +16,8 @@ import psutil
 import os
 from collections import deque
 import sys
+from permutation_rank import is_solvable, rank
+from search_control import Budget, drive, SOLVED, UNSOLVABLE
 
 # class Board - This class defines the state of the problem in terms of board configuration
 # Class Variables:
@@ -117,14 +119,15 @@ class Search:
         return childrenList
 
     # find_path() - This function backtracks from current node to reach initial configuration. The list of actions would constitute a solution path
-    def find_path(self, node):
+    #               Pass show=False to skip printing the path.
+    def find_path(self, node, show=True):
         currentPath = []
         cur_node = node
         while cur_node:  # Backtrack and record moves
             if(cur_node.action != None): currentPath.append(cur_node.action)
             cur_node = cur_node.parent
         currentPath.reverse()
-        print("Path: ", currentPath)
+        if show: print("Path: ", currentPath)
         return currentPath
 
     # goal_test() - Check if current tiles matches the expected board
@@ -137,6 +140,7 @@ class Search:
         final_tiles = [[1,2,3,4],[5,6,7,8],[9,10,11,12],[13,14,15,0]]
         i, j = 0, 0
         while i < 4:
+            j = 0
             while j < 4:
                 if(tile == final_tiles[i][j]):
                     return i, j
@@ -149,6 +153,7 @@ class Search:
         final_tiles = [[1,2,3,4],[5,6,7,8],[9,10,11,12],[13,14,15,0]]
         i, j, tileCounter = 0, 0, 0
         while i < 4:
+            j = 0
             while j < 4:
                 if(node.state.tiles[i][j] != final_tiles[i][j]):
                     tileCounter += 1
@@ -161,6 +166,7 @@ class Search:
         totalDistance = 0
         i, j = 0, 0
         while i < 4:
+            j = 0
             while j < 4:
                 currentTile = node.state.tiles[i][j]
                 if currentTile != 0:
@@ -170,33 +176,48 @@ class Search:
             i += 1
         return totalDistance
     
-    # run_a_star() - Runs A* search for the puzzle solution. Uses the passed heuristic function.
-    def run_a_star(self, root_node, heuristic_function):
-        solvedPuzzle = 0
-        solutionNode = None
-        # Declare and intialize return variables
-        path = []               # list of char
-        expanded_nodes = 0      # int
-        time_taken = ''         # str + "ms"
-        memory_consumed = ''    # str + "kb"
+    # a_star_steps() - Step engine for A* search. Yields Progress snapshots (bound = f-score being expanded)
+    #                  and returns an Outcome (solved / budget exhausted / cancelled / unsolvable) instead of calling exit().
+    #                  With an endgame table (see endgame_db.py) boards in the table use their exact distance as the heuristic
+    #                  and the search stops when one of them is expanded.
+    #                  With a Checkpointer (see checkpoint.py) the frontier and its ancestors are saved every interval and when
+    #                  the budget runs out, and an existing checkpoint is resumed at the same expansion count.
+    def a_star_steps(self, root_node, heuristic_function, budget=None, endgame=None, checkpoint=None):
+        if endgame is not None:
+            heuristic_function = self.endgame_heuristic(heuristic_function, endgame)
+        if budget is None: budget = Budget()
+        budget.start()
+        expanded_nodes = 0
+        if not is_solvable(root_node.state.tiles):     # Half of all boards can never reach the goal
+            return budget.outcome(UNSOLVABLE, None, expanded_nodes)
 
-        startTime = time.time()                 # Used to calculate time_taken
-        process = psutil.Process(os.getpid())   # Used to calculate memory_consumed
-        
         # -- Start of A* Search --
-        frontier = [root_node]  # Will use deque as a FIFO queue.
-        cameFrom = None # cameFrom is the node preceding the current node.
-        root_node.gscore = 0
-        root_node.fscore = heuristic_function(root_node)
-        returnValue = 'Failure'
+        rootRank = rank(root_node.state.tiles)
+        if checkpoint is not None and checkpoint.exists():     # Resume where the last run stopped
+            meta, frontier = checkpoint.load(lambda tiles, parent, action, fields: Node(Board(tiles), parent, action, fields[0], fields[1]))
+            if meta["kind"] != "a_star" or meta["root"] != rootRank:
+                raise ValueError("Checkpoint {} belongs to a different search".format(checkpoint.path))
+            expanded_nodes = meta["expanded_nodes"]
+        else:
+            frontier = [root_node]  # Will use deque as a FIFO queue.
+            cameFrom = None # cameFrom is the node preceding the current node.
+            root_node.gscore = 0
+            root_node.fscore = heuristic_function(root_node)
         while len(frontier) != 0:
+            status = budget.check(expanded_nodes)   # Stop early if out of budget or cancelled
+            if status is not None:
+                if checkpoint is not None: self.save_checkpoint(checkpoint, rootRank, expanded_nodes, frontier)
+                return budget.outcome(status, None, expanded_nodes)
             # Sort frontier, then remove lowest value
             frontier.sort(key=lambda node: node.fscore, reverse=False)
             currentNode = frontier.pop(0)
             # Check if current node is solution.
             if self.goal_test(currentNode.state.tiles):
-                returnValue = currentNode
-                break
+                if checkpoint is not None: checkpoint.clear()
+                return budget.outcome(SOLVED, self.find_path(currentNode, False), expanded_nodes)
+            if endgame is not None and endgame.find(currentNode.state.tiles) >= 0:
+                if checkpoint is not None: checkpoint.clear()
+                return budget.outcome(SOLVED, self.find_path(currentNode, False) + endgame.tail(currentNode.state.tiles), expanded_nodes)
             # Expand current node and calculate gscore and fscore for children.
             currentChildren = self.get_children(currentNode)    
             expanded_nodes += 1
@@ -210,17 +231,47 @@ class Search:
                 # Add child if not already in frontier.
                 if child not in frontier:
                     frontier.append(child)
-        # -- End of A* Search --
-                    
-        if(returnValue == 'Failure'):
+            if checkpoint is not None and checkpoint.due():
+                self.save_checkpoint(checkpoint, rootRank, expanded_nodes, frontier)
+            if budget.report_due(expanded_nodes):
+                yield budget.progress(expanded_nodes, currentNode.fscore, len(frontier))
+        if checkpoint is not None: checkpoint.clear()
+        return budget.outcome(UNSOLVABLE, None, expanded_nodes)   # -- End of A* Search --
+
+    # save_checkpoint() - Saves the A* frontier (in its current order), the nodes on its paths and the expansion count
+    def save_checkpoint(self, checkpoint, rootRank, expanded_nodes, frontier):
+        meta = {"kind": "a_star", "root": rootRank, "expanded_nodes": expanded_nodes}
+        checkpoint.save(meta, frontier, ["gscore", "fscore"])
+
+    # endgame_heuristic() - Returns a heuristic that uses the exact distance for boards in the endgame table
+    def endgame_heuristic(self, heuristic_function, endgame):
+        def heuristic(node):
+            remaining = endgame.distance(node.state.tiles)
+            return heuristic_function(node) if remaining is None else remaining
+        return heuristic
+
+    # run_a_star() - Runs A* search for the puzzle solution. Uses the passed heuristic function.
+    def run_a_star(self, root_node, heuristic_function, endgame=None, checkpoint=None):
+        # Declare and intialize return variables
+        path = []               # list of char
+        expanded_nodes = 0      # int
+        time_taken = ''         # str + "ms"
+        memory_consumed = ''    # str + "kb"
+
+        startTime = time.time()                 # Used to calculate time_taken
+        process = psutil.Process(os.getpid())   # Used to calculate memory_consumed
+
+        outcome = drive(self.a_star_steps(root_node, heuristic_function, endgame=endgame, checkpoint=checkpoint))
+        if not outcome.solved():
             print("Could not solve puzzle.")
             exit()
-        solutionNode = returnValue
         
         # Evaluate return variables
         time_taken = "{} ms".format(str((time.time() - startTime)*60))
         memory_consumed = "{} bytes".format(str((process.memory_info().rss)))
-        path = self.find_path(solutionNode)
+        path = outcome.path
+        expanded_nodes = outcome.expanded_nodes
+        print("Path: ", path)
 
         # Return the values
         return path, expanded_nodes, time_taken, memory_consumed
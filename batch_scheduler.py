@@ -0,0 +1,148 @@
+##################################################################
+# Batch Scheduler for 15 Puzzle Solvers
+#
+# Description: Solves a file of boards across a pool of worker processes. Every
+#              board gets a cheap difficulty estimate (Manhattan distance plus
+#              linear conflicts, a lower bound on its solution length) which picks
+#              the algorithm and the dispatch order: hardest boards go first, so one
+#              deep board submitted last can't stretch the whole batch.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * Longest-first list scheduling: workers take the next job as soon as they are free.
+# * Reports the achieved makespan against max(longest job, total work / workers).
+##################################################################
+
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from permutation_rank import is_solvable
+from search_control import UNSOLVABLE
+
+# Boards whose lower bound is at most this are solved with BFS, the rest with A* (Manhattan distance)
+BFS_LIMIT = 12
+
+# manhattan_linear_conflict() - Returns Manhattan distance plus 2 moves for every tile that has to step out of its goal row
+#                               (or column) to let tiles in the wrong order pass. Never overestimates the number of moves left.
+def manhattan_linear_conflict(tiles):
+    totalDistance = 0
+    rows = [[] for _ in range(4)]       # Goal columns of the tiles already in their goal row, left to right
+    columns = [[] for _ in range(4)]    # Goal rows of the tiles already in their goal column, top to bottom
+    for cell, tile in enumerate(tiles):
+        if tile == 0: continue
+        i, j = divmod(cell, 4)
+        row, column = divmod(tile - 1, 4)
+        totalDistance += abs(row - i) + abs(column - j)
+        if row == i: rows[i].append(column)
+        if column == j: columns[j].append(row)
+    for line in rows + columns:
+        totalDistance += 2 * conflicts(line)
+    return totalDistance
+
+# conflicts() - Returns the fewest tiles that have to leave a line so the rest are in goal order (length - longest increasing run)
+def conflicts(goals):
+    longest = [1] * len(goals)
+    for i in range(len(goals)):
+        for j in range(i):
+            if goals[j] < goals[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return len(goals) - max(longest, default=0)
+
+# choose_algorithm() - Returns "bfs" for shallow boards and "a_star" for the rest
+def choose_algorithm(lower_bound, bfs_limit=BFS_LIMIT):
+    return "bfs" if lower_bound <= bfs_limit else "a_star"
+
+# Endgame table shared by every job in a worker process (see init_worker)
+_endgame = None
+
+# init_worker() - Loads the endgame table once per worker process
+def init_worker(endgame_path):
+    global _endgame
+    if endgame_path is not None:
+        from endgame_db import load_endgame_db
+        _endgame = load_endgame_db(endgame_path)
+
+# solve_job() - Solves one board in a worker process.
+#               Returns (index, algorithm, status, number of moves, expanded nodes, seconds).
+def solve_job(index, tiles, algorithm, max_nodes, max_seconds):
+    from search_control import Budget, drive
+    budget = Budget(max_nodes=max_nodes, max_seconds=max_seconds)
+    startTime = time.time()
+    if algorithm == "bfs":
+        import bfs_search
+        root = bfs_search.Node(bfs_search.Board(tiles), None, None)
+        outcome = drive(bfs_search.Search().bfs_steps(root, budget, _endgame))
+    else:
+        import astar_search_manhattan
+        agent = astar_search_manhattan.Search()
+        root = astar_search_manhattan.Node(astar_search_manhattan.Board(tiles), None, None, 0, 0)
+        outcome = drive(agent.a_star_steps(root, agent.total_manhattan_distance, budget, _endgame))
+    moves = len(outcome.path) if outcome.solved() else None
+    return index, algorithm, outcome.status, moves, outcome.expanded_nodes, time.time() - startTime
+
+# read_boards() - Reads one board per line (same format as Search.solve), skipping blank lines
+def read_boards(path):
+    boards = []
+    with open(path) as f:
+        for line in f:
+            tiles = [int(s) for s in line.split() if s.isdigit()]
+            if len(tiles) != 0: boards.append(tiles)
+    return boards
+
+# schedule() - Solves every board hardest first across worker processes. Returns (results in board order, summary dict).
+def schedule(boards, workers=None, max_nodes=None, max_seconds=None, endgame_path=None, bfs_limit=BFS_LIMIT):
+    if workers is None: workers = os.cpu_count() or 1
+    # 1. Estimate every board and order the jobs longest first
+    estimates = [manhattan_linear_conflict(tiles) for tiles in boards]
+    order = sorted(range(len(boards)), key=lambda i: estimates[i], reverse=True)
+
+    # 2. Dispatch in that order; the pool hands each job to the next free worker
+    results = [None] * len(boards)
+    startTime = time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(endgame_path,)) as pool:
+        futures = []
+        for i in order:
+            if not is_solvable(boards[i]):
+                results[i] = (i, None, UNSOLVABLE, None, 0, 0.0)
+                continue
+            algorithm = choose_algorithm(estimates[i], bfs_limit)
+            futures.append(pool.submit(solve_job, i, boards[i], algorithm, max_nodes, max_seconds))
+        for future in as_completed(futures):
+            result = future.result()
+            results[result[0]] = result
+    makespan = time.time() - startTime
+
+    # 3. No schedule of these jobs on this many workers can finish faster than the longest job or the average load
+    jobTimes = [result[5] for result in results]
+    totalWork = sum(jobTimes)
+    lowerBound = max(max(jobTimes, default=0.0), totalWork / workers)
+    summary = {
+        "workers": workers,
+        "makespan": makespan,
+        "lower_bound": lowerBound,
+        "ratio": makespan / lowerBound if lowerBound > 0 else 1.0,
+        "utilization": totalWork / (workers * makespan) if makespan > 0 else 1.0,
+        "estimates": estimates,
+    }
+    return results, summary
+
+# Running a batch from the command line, e.g. python batch_scheduler.py boards.txt --workers 8 --max-seconds 60
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Solve a file of 15 puzzle boards, hardest first.")
+    parser.add_argument("boards", help="file with one board per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-nodes", type=int, default=None, help="expansion budget per board")
+    parser.add_argument("--max-seconds", type=float, default=None, help="time budget per board")
+    parser.add_argument("--endgame", default=None, help="endgame table file (see endgame_db.py)")
+    parser.add_argument("--bfs-limit", type=int, default=BFS_LIMIT, help="largest lower bound solved with BFS")
+    args = parser.parse_args()
+
+    boards = read_boards(args.boards)
+    results, summary = schedule(boards, args.workers, args.max_nodes, args.max_seconds, args.endgame, args.bfs_limit)
+    for index, algorithm, status, moves, expanded_nodes, seconds in results:
+        print("Board {}: {} (estimate {}, {}) moves={} expanded={} time={:.3f}s".format(
+            index, status, summary["estimates"][index], algorithm, moves, expanded_nodes, seconds))
+    print("Makespan: {:.3f}s".format(summary["makespan"]))
+    print("Lower Bound: {:.3f}s (ratio {:.2f})".format(summary["lower_bound"], summary["ratio"]))
+    print("Utilization: {:.0%} of {} workers".format(summary["utilization"], summary["workers"]))
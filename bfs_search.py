@@ -17,6 +17,9 @@ import psutil
 import os
 from collections import deque
 import sys
+from permutation_rank import rank, is_solvable
+from search_control import Budget, drive, SOLVED, UNSOLVABLE
+from frontier_search import frontier_search_steps
 
 # class Board - This class defines the state of the problem in terms of board configuration
 # Class Variables:
@@ -104,14 +107,15 @@ class Search:
         return childrenList
 
     # find_path() - This function backtracks from current node to reach initial configuration. The list of actions would constitute a solution path
-    def find_path(self, node):
+    #               Pass show=False to skip printing the path.
+    def find_path(self, node, show=True):
         currentPath = []
         cur_node = node
         while cur_node:  # Backtrack and record moves
             if(cur_node.action != None): currentPath.append(cur_node.action)
             cur_node = cur_node.parent
         currentPath.reverse()
-        print("Path: ", currentPath)
+        if show: print("Path: ", currentPath)
         return currentPath
 
     # goal_test() - Check if current tiles matches the expected board
@@ -119,59 +123,109 @@ class Search:
         final_tiles = [[1,2,3,4],[5,6,7,8],[9,10,11,12],[13,14,15,0]]
         return cur_tiles == final_tiles
     
-    # run_bfs() - This function runs breadth first search from the given root node and returns path, number of nodes expanded and total time taken
-    def run_bfs(self, root_node):
-        solvedPuzzle = -1
-        solutionNode = None
-        # Declare and intialize return variables
-        path = []               # list of char
-        expanded_nodes = 0      # int
-        time_taken = ''         # str + "ms"
-        memory_consumed = ''    # str + "kb"
-
-        startTime = time.time()                 # Used to calculate time_taken
-        process = psutil.Process(os.getpid())   # Used to calculate memory_consumed
+    # bfs_steps() - Step engine for breadth first search. Yields a Progress snapshot every budget.report_every expansions
+    #               and returns an Outcome (solved / budget exhausted / cancelled / unsolvable) instead of calling exit().
+    #               With an endgame table (see endgame_db.py) the search stops at the first board in the table.
+    def bfs_steps(self, root_node, budget=None, endgame=None):
+        if budget is None: budget = Budget()
+        budget.start()
+        expanded_nodes = 0
+        if not is_solvable(root_node.state.tiles):     # Half of all boards can never reach the goal
+            return budget.outcome(UNSOLVABLE, None, expanded_nodes)
 
         # -- Start of Breadth-First-Search --
         # 1. Check on root node, the initial node, if it is the goal (the solved puzzle)
-        if(self.goal_test(root_node.state.tiles)): solvedPuzzle = 1
+        if(self.goal_test(root_node.state.tiles)): return budget.outcome(SOLVED, [], expanded_nodes)
+        if endgame is not None and endgame.find(root_node.state.tiles) >= 0:
+            return budget.outcome(SOLVED, endgame.tail(root_node.state.tiles), expanded_nodes)
         # 2. Declare and initialize frontier and reached.
         frontier = deque([root_node])  # Doubly ended queue for the frontier. Add 
-        reached = set({root_node})     # Hashset for explored nodes
+        reached = set({rank(root_node.state.tiles)})    # Hashset of explored state ranks (ints are far smaller than Nodes)
         # 3. Loop while frontier is full or puzzle hasn't been solved yet.
-        while len(frontier) != 0 and solvedPuzzle == -1:
+        while len(frontier) != 0:
+            status = budget.check(expanded_nodes)               # Stop early if out of budget or cancelled
+            if status is not None: return budget.outcome(status, None, expanded_nodes)
             currentNode = frontier.popleft()                        # 3.1. Pop the front of the frontier
             currentChildren = self.get_children(currentNode)    # 3.2. Get children of currentNode
             expanded_nodes += 1
             for child in currentChildren:                       # 3.3. Evaluate each child
                 s = child.state.tiles
                 if self.goal_test(s):       # 3.4. If child is the goal, accept as the solution and end BFS.
-                    solutionNode = child
-                    solvedPuzzle = 1
-                    break
-                if child not in reached:    # 3.5. Add child if it is not in reached set (not explored already)
+                    return budget.outcome(SOLVED, self.find_path(child, False), expanded_nodes)
+                # 3.4.1. If child is in the endgame table, append the stored moves. The parent wasn't in the table, so the child
+                #        is exactly endgame.depth moves from the goal and no later board can do better.
+                if endgame is not None and endgame.find(s) >= 0:
+                    return budget.outcome(SOLVED, self.find_path(child, False) + endgame.tail(s), expanded_nodes)
+                childRank = rank(s)
+                if childRank not in reached:    # 3.5. Add child if it is not in reached set (not explored already)
                     #expanded_nodes += 1
-                    reached.add(child)          # Add child to reached nodes
+                    reached.add(childRank)      # Add child to reached nodes
                     frontier.append(child)  # Add child to frontier
-        # 4. If the goal was not reached, return error
-        if(solvedPuzzle == -1): 
+            if budget.report_due(expanded_nodes):
+                yield budget.progress(expanded_nodes, None, len(frontier))
+        # 4. If the goal was not reached, the puzzle is unsolvable
+        return budget.outcome(UNSOLVABLE, None, expanded_nodes)    # -- End of Breadth-First-Search --
+
+    # run_bfs() - This function runs breadth first search from the given root node and returns path, number of nodes expanded and total time taken
+    def run_bfs(self, root_node, endgame=None):
+        # Declare and intialize return variables
+        path = []               # list of char
+        expanded_nodes = 0      # int
+        time_taken = ''         # str + "ms"
+        memory_consumed = ''    # str + "kb"
+
+        startTime = time.time()                 # Used to calculate time_taken
+        process = psutil.Process(os.getpid())   # Used to calculate memory_consumed
+
+        outcome = drive(self.bfs_steps(root_node, endgame=endgame))
+        if not outcome.solved():
             print("Could not solve puzzle.")
             exit()
-        # -- End of Breadth-First-Search --
 
         # Evaluate return variables
         time_taken = "{} ms".format(str((time.time() - startTime)*60))
         memory_consumed = "{} bytes".format(str((process.memory_info().rss)))
-        path = self.find_path(solutionNode)
+        path = outcome.path
+        expanded_nodes = outcome.expanded_nodes
+        print("Path: ", path)
 
         # Return the values
         return path, expanded_nodes, time_taken, memory_consumed
             
-    # solve() - Solve the given input
-    def solve(self, input):
+    # run_frontier_bfs() - Same as run_bfs, but uses frontier search (see frontier_search.py) so only the open layers are kept in memory
+    def run_frontier_bfs(self, root_node):
+        # Declare and intialize return variables
+        path = []               # list of char
+        expanded_nodes = 0      # int
+        time_taken = ''         # str + "ms"
+        memory_consumed = ''    # str + "kb"
+
+        startTime = time.time()                 # Used to calculate time_taken
+        process = psutil.Process(os.getpid())   # Used to calculate memory_consumed
+
+        outcome = drive(frontier_search_steps(root_node.state.tiles))
+        if not outcome.solved():
+            print("Could not solve puzzle.")
+            exit()
+
+        # Evaluate return variables
+        time_taken = "{} ms".format(str((time.time() - startTime)*60))
+        memory_consumed = "{} bytes".format(str((process.memory_info().rss)))
+        path = outcome.path
+        expanded_nodes = outcome.expanded_nodes
+        print("Path: ", path)
+
+        # Return the values
+        return path, expanded_nodes, time_taken, memory_consumed
+
+    # solve() - Solve the given input. Set frontier_search to keep only the open layers in memory.
+    def solve(self, input, frontier_search=False):
         initial_list = [int(s) for s in input.split() if s.isdigit()]
         root = Node(Board(initial_list), None, None)
-        path, expanded_nodes, time_taken, memory_consumed = self.run_bfs(root)
+        if frontier_search:
+            path, expanded_nodes, time_taken, memory_consumed = self.run_frontier_bfs(root)
+        else:
+            path, expanded_nodes, time_taken, memory_consumed = self.run_bfs(root)
         print("Moves: " + " ".join(path))
         print("Number of expanded Nodes: " + str(expanded_nodes))
         print("Time Taken: " + str(time_taken))
@@ -182,4 +236,5 @@ class Search:
 if __name__ == '__main__':
     agent = Search()
     #agent.solve("1 2 3 4 5 6 7 8 9 10 11 0 13 14 15 12")
-    agent.solve("1 0 2 4 5 7 3 8 9 6 11 12 13 10 14 15")
\ No newline at end of file
+    agent.solve("1 0 2 4 5 7 3 8 9 6 11 12 13 10 14 15")
+    #agent.solve("1 0 2 4 5 7 3 8 9 6 11 12 13 10 14 15", frontier_search=True)
\ No newline at end of file
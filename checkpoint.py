@@ -0,0 +1,118 @@
+##################################################################
+# Checkpoints for Long Running Searches
+#
+# Description: Saves the state of a search (frontier, every node reachable from it
+#              through parent pointers, counters) to a compact binary file at a
+#              fixed interval, so a preempted A* or IDDFS run can resume at the same
+#              expansion count instead of starting over.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * File layout: magic, version, JSON header length, JSON header, then one array per
+#   node column (parent index, action, state rank, int fields) and the frontier indices.
+# * Writes go to a temporary file which is renamed over the old checkpoint, so a crash
+#   mid-write never leaves a broken checkpoint behind.
+##################################################################
+
+import os
+import time
+import json
+import struct
+from array import array
+from permutation_rank import rank, unrank
+
+MAGIC = b"P15C"
+VERSION = 1
+ACTIONS = ["U", "D", "L", "R"]
+
+# class Checkpointer - Writes and reads the checkpoint file of one search
+# Class Variables:
+#   path - Checkpoint file
+#   interval - Seconds between checkpoints (float)
+#   lastSave - time.monotonic() of the last save
+class Checkpointer:
+    def __init__(self, path, interval=60.0):
+        self.path = path
+        self.interval = interval
+        self.lastSave = time.monotonic()
+
+    # due() - Returns true if interval seconds have passed since the last save
+    def due(self):
+        return time.monotonic() - self.lastSave >= self.interval
+
+    # exists() - Returns true if there is a checkpoint to resume from
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # clear() - Removes the checkpoint (called once a search has finished)
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # save() - Writes meta (dict of JSON values), the frontier nodes in order, and all their ancestors.
+    #          field_names are the int attributes stored for every node (e.g. ["gscore", "fscore"]).
+    def save(self, meta, frontier, field_names):
+        # Number nodes so every parent comes before its children
+        index = {}
+        nodes = []
+        for node in frontier:
+            chain = []
+            cur_node = node
+            while cur_node is not None and id(cur_node) not in index:
+                chain.append(cur_node)
+                cur_node = cur_node.parent
+            for cur_node in reversed(chain):
+                index[id(cur_node)] = len(nodes)
+                nodes.append(cur_node)
+
+        parents = array("i", [index[id(node.parent)] if node.parent is not None else -1 for node in nodes])
+        actions = array("b", [ACTIONS.index(node.action) if node.action is not None else -1 for node in nodes])
+        ranks = array("Q", [rank(node.state.tiles) for node in nodes])
+        fields = array("i", [getattr(node, name) for node in nodes for name in field_names])
+        frontierIndices = array("i", [index[id(node)] for node in frontier])
+
+        header = dict(meta)
+        header["field_names"] = field_names
+        header["node_count"] = len(nodes)
+        header["frontier_count"] = len(frontier)
+        headerBytes = json.dumps(header).encode()
+
+        tmpPath = self.path + ".tmp"
+        with open(tmpPath, "wb") as out:
+            out.write(MAGIC + struct.pack("<BI", VERSION, len(headerBytes)))
+            out.write(headerBytes)
+            for column in (parents, actions, ranks, fields, frontierIndices):
+                out.write(column.tobytes())
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmpPath, self.path)
+        self.lastSave = time.monotonic()
+
+    # load() - Reads the checkpoint. make_node(tiles, parent, action, fields) rebuilds one node, where tiles is a flat list
+    #          and fields are the saved ints in field_names order. Returns (meta, frontier list in the saved order).
+    def load(self, make_node):
+        with open(self.path, "rb") as f:
+            start = f.read(9)
+            if start[:4] != MAGIC:
+                raise ValueError("{} is not a search checkpoint".format(self.path))
+            version, headerLength = struct.unpack("<BI", start[4:])
+            if version != VERSION:
+                raise ValueError("Unsupported checkpoint version {}".format(version))
+            meta = json.loads(f.read(headerLength).decode())
+            nodeCount = meta["node_count"]
+            fieldCount = len(meta["field_names"])
+            columns = []
+            for typecode, length in (("i", nodeCount), ("b", nodeCount), ("Q", nodeCount),
+                                     ("i", nodeCount * fieldCount), ("i", meta["frontier_count"])):
+                column = array(typecode)
+                column.frombytes(f.read(column.itemsize * length))
+                columns.append(column)
+        parents, actions, ranks, fields, frontierIndices = columns
+
+        nodes = []
+        for i in range(nodeCount):
+            parent = nodes[parents[i]] if parents[i] >= 0 else None
+            action = ACTIONS[actions[i]] if actions[i] >= 0 else None
+            nodes.append(make_node(unrank(ranks[i], 16), parent, action, list(fields[i * fieldCount:(i + 1) * fieldCount])))
+        self.lastSave = time.monotonic()
+        return meta, [nodes[i] for i in frontierIndices]
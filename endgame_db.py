@@ -0,0 +1,135 @@
+##################################################################
+# Endgame Database for 15 Puzzle
+#
+# Description: Every board within k moves of the goal, with its exact distance and
+#              the next move towards the goal, built by a backwards breadth first
+#              search from the goal. The solvers stop as soon as they reach a board
+#              in the table and append the stored moves, which removes the last k
+#              layers of every search.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * Stored as a sorted array of state ranks (8 bytes each) plus one byte per state
+#   (distance in the low 5 bits, next move in the top 2 bits).
+##################################################################
+
+import os
+import struct
+import argparse
+from array import array
+from bisect import bisect_left
+from permutation_rank import rank, unrank, flatten
+from frontier_search import GOAL, MOVES, NEIGHBORS, expand_layer
+from search_control import Budget, drive
+
+MAGIC = b"P15E"
+VERSION = 1
+MAX_DEPTH = 31      # Distances have to fit in 5 bits
+
+# class EndgameDB - Lookup table of every board within depth moves of the goal
+# Class Variables:
+#   depth - Largest distance stored (k)
+#   ranks - Sorted state ranks (array of unsigned 64 bit ints)
+#   info - One byte per rank: distance | (next move index << 5)
+class EndgameDB:
+    def __init__(self, depth, ranks, info):
+        self.depth = depth
+        self.ranks = ranks
+        self.info = info
+
+    # __len__() - Number of boards in the table
+    def __len__(self):
+        return len(self.ranks)
+
+    # find() - Returns the position of the board's rank in the table, or -1 if the board is further than depth from the goal
+    def find(self, tiles):
+        stateRank = rank(tiles)
+        position = bisect_left(self.ranks, stateRank)
+        if position < len(self.ranks) and self.ranks[position] == stateRank:
+            return position
+        return -1
+
+    # distance() - Returns the exact number of moves to the goal, or None if it is more than depth
+    def distance(self, tiles):
+        position = self.find(tiles)
+        if position < 0: return None
+        return self.info[position] & 0x1F
+
+    # tail() - Returns the optimal moves from the board to the goal, or None if it isn't in the table
+    def tail(self, tiles):
+        position = self.find(tiles)
+        if position < 0: return None
+        tiles = list(flatten(tiles))
+        moves = []
+        while self.info[position] & 0x1F != 0:
+            m = self.info[position] >> 5
+            moves.append(MOVES[m])
+            # Apply the move to the empty tile and look up the next board
+            blank = tiles.index(0)
+            target = [t for move, t in NEIGHBORS[blank] if move == m][0]
+            tiles[blank], tiles[target] = tiles[target], 0
+            position = self.find(tiles)
+        return moves
+
+    # save() - Writes the table to a compact binary file (written to a temporary file first, then renamed)
+    def save(self, path):
+        tmpPath = path + ".tmp"
+        with open(tmpPath, "wb") as out:
+            out.write(MAGIC + struct.pack("<BBI", VERSION, self.depth, len(self.ranks)))
+            out.write(self.ranks.tobytes())
+            out.write(bytes(self.info))
+        os.replace(tmpPath, path)
+
+# build_endgame_db() - Backwards breadth first search from the goal, keeping every board within depth moves
+def build_endgame_db(depth):
+    if depth > MAX_DEPTH:
+        raise ValueError("Endgame depth must be at most {}".format(MAX_DEPTH))
+    goalRank = rank(GOAL)
+    entries = {goalRank: 0}
+    layer = {goalRank: 0}
+    for d in range(1, depth + 1):
+        layer, meet = drive(expand_layer(layer, {}, Budget(), [0], d))
+        for stateRank, used in layer.items():
+            # The used operators of a backwards layer are exactly the moves that lead one step closer to the goal
+            nextMove = (used & -used).bit_length() - 1
+            entries[stateRank] = d | (nextMove << 5)
+    ranks = array("Q", sorted(entries))
+    info = bytearray(entries[stateRank] for stateRank in ranks)
+    return EndgameDB(depth, ranks, info)
+
+# load_endgame_db() - Reads a table written by EndgameDB.save()
+def load_endgame_db(path):
+    with open(path, "rb") as f:
+        header = f.read(10)
+        if header[:4] != MAGIC:
+            raise ValueError("{} is not an endgame database".format(path))
+        version, depth, count = struct.unpack("<BBI", header[4:])
+        if version != VERSION:
+            raise ValueError("Unsupported endgame database version {}".format(version))
+        ranks = array("Q")
+        ranks.frombytes(f.read(8 * count))
+        info = bytearray(f.read(count))
+    return EndgameDB(depth, ranks, info)
+
+# load_or_build_endgame_db() - Loads the table from path if it exists, otherwise builds it and saves it there
+def load_or_build_endgame_db(path, depth):
+    if os.path.exists(path):
+        table = load_endgame_db(path)
+        if table.depth == depth:
+            return table
+    table = build_endgame_db(depth)
+    table.save(path)
+    return table
+
+# Building a table from the command line, e.g. python endgame_db.py --depth 14 --output endgame_14.bin
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the 15 puzzle endgame database.")
+    parser.add_argument("--depth", type=int, default=12, help="largest distance from the goal to store")
+    parser.add_argument("--output", default=None, help="output file (default: endgame_<depth>.bin)")
+    args = parser.parse_args()
+
+    table = build_endgame_db(args.depth)
+    path = args.output if args.output is not None else "endgame_{}.bin".format(args.depth)
+    table.save(path)
+    print("Boards stored: " + str(len(table)))
+    print("File size (Bytes): " + str(os.path.getsize(path)))
@@ -0,0 +1,113 @@
+##################################################################
+# Frontier Search on 15 Puzzle
+#
+# Description: Divide-and-conquer bidirectional frontier search (Korf). Only the open
+#              layer of each search direction is kept in memory, as a dict from state
+#              rank to the moves that lead back into the previous layer (used-operator
+#              bits). There is no closed list and no parent pointers: when the two
+#              frontiers meet, the meeting state is a midpoint of an optimal path and
+#              both halves are solved the same way recursively.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * Memory is bounded by the width of the frontiers instead of every state explored.
+##################################################################
+
+from permutation_rank import rank, unrank, is_solvable, flatten
+from search_control import Budget, SOLVED, UNSOLVABLE
+
+GOAL = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 0]
+MOVES = ["U", "D", "L", "R"]
+INVERSE = [1, 0, 3, 2]      # Index of the move that undoes MOVES[i]
+# NEIGHBORS[cell] - (move index, target cell) for every legal move of the empty tile at cell
+NEIGHBORS = []
+for cell in range(16):
+    row, column = divmod(cell, 4)
+    cellMoves = []
+    if row > 0: cellMoves.append((0, cell - 4))
+    if row < 3: cellMoves.append((1, cell + 4))
+    if column > 0: cellMoves.append((2, cell - 1))
+    if column < 3: cellMoves.append((3, cell + 1))
+    NEIGHBORS.append(cellMoves)
+
+# move_between() - Returns the move that takes the empty tile from one state to an adjacent state
+def move_between(fromRank, toRank):
+    fromBlank = unrank(fromRank, 16).index(0)
+    toBlank = unrank(toRank, 16).index(0)
+    for m, target in NEIGHBORS[fromBlank]:
+        if target == toBlank: return MOVES[m]
+    return None
+
+# expand_layer() - Generates the next layer of a frontier search, skipping used operators. Yields Progress snapshots.
+#                  Returns (next layer, meet) where meet is a state also in other, None, or a budget status string.
+def expand_layer(layer, other, budget, counter, bound):
+    nextLayer = {}
+    for stateRank, used in layer.items():
+        status = budget.check(counter[0])   # Stop early if out of budget or cancelled
+        if status is not None:
+            return nextLayer, status
+        tiles = unrank(stateRank, 16)
+        blank = tiles.index(0)
+        counter[0] += 1
+        for m, target in NEIGHBORS[blank]:
+            if (used >> m) & 1: continue        # This move leads back into the previous layer
+            tiles[blank], tiles[target] = tiles[target], 0
+            childRank = rank(tiles)
+            tiles[target], tiles[blank] = tiles[blank], 0
+            # Mark the move leading back to the parent as used in the child
+            nextLayer[childRank] = nextLayer.get(childRank, 0) | (1 << INVERSE[m])
+            if childRank in other:      # Frontiers meet: childRank lies on an optimal path
+                return nextLayer, childRank
+        if budget.report_due(counter[0]):
+            yield budget.progress(counter[0], bound, len(layer) + len(other) + len(nextLayer))
+    return nextLayer, None
+
+# find_midpoint() - Bidirectional frontier search between two states. Returns (midpoint rank, distance start -> midpoint,
+#                   distance midpoint -> goal), None if the frontiers never meet, or a budget status string.
+def find_midpoint(startRank, goalRank, budget, counter):
+    forward, backward = {startRank: 0}, {goalRank: 0}
+    forwardDepth, backwardDepth = 0, 0
+    while len(forward) != 0 and len(backward) != 0:
+        bound = forwardDepth + backwardDepth + 1
+        if len(forward) <= len(backward):   # Always grow the smaller frontier
+            forward, meet = yield from expand_layer(forward, backward, budget, counter, bound)
+            forwardDepth += 1
+        else:
+            backward, meet = yield from expand_layer(backward, forward, budget, counter, bound)
+            backwardDepth += 1
+        if isinstance(meet, str):
+            return meet
+        if meet is not None:
+            return meet, forwardDepth, backwardDepth
+    return None
+
+# solve_between() - Recursively builds an optimal move list between two states from midpoints (divide and conquer).
+#                   Returns the list of moves, None if there is no path, or a budget status string.
+def solve_between(startRank, goalRank, budget, counter):
+    if startRank == goalRank: return []
+    result = yield from find_midpoint(startRank, goalRank, budget, counter)
+    if result is None or isinstance(result, str): return result
+    meet, toMiddle, fromMiddle = result
+    if toMiddle + fromMiddle == 1:
+        return [move_between(startRank, goalRank)]
+    firstHalf = yield from solve_between(startRank, meet, budget, counter)
+    if isinstance(firstHalf, str): return firstHalf
+    secondHalf = yield from solve_between(meet, goalRank, budget, counter)
+    if isinstance(secondHalf, str): return secondHalf
+    return firstHalf + secondHalf
+
+# frontier_search_steps() - Step engine for frontier search (see search_control.py). tiles may be flat or 2D.
+#                           Yields Progress snapshots (bound = depth searched so far) and returns an Outcome.
+def frontier_search_steps(tiles, budget=None, goal=GOAL):
+    if budget is None: budget = Budget()
+    budget.start()
+    tiles = flatten(tiles)
+    if not is_solvable(tiles):
+        return budget.outcome(UNSOLVABLE, None, 0)
+    counter = [0]       # Expansions over every sub-search
+    path = yield from solve_between(rank(tiles), rank(goal), budget, counter)
+    if path is None:
+        return budget.outcome(UNSOLVABLE, None, counter[0])
+    if isinstance(path, str):
+        return budget.outcome(path, None, counter[0])
+    return budget.outcome(SOLVED, path, counter[0])
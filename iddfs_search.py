@@ -16,6 +16,9 @@ import psutil
 import os
 from collections import deque
 import sys
+from permutation_rank import is_solvable, rank
+from move_pruning import get_move_fsm, MOVE_INDEX
+from search_control import Budget, drive, SOLVED, UNSOLVABLE, BUDGET_EXHAUSTED, CANCELLED
 
 # class Board - This class defines the state of the problem in terms of board configuration
 # Class Variables:
@@ -63,12 +66,14 @@ class Board:
 #   parent - Parent Node (Node data type)
 #   action - Direction to move empty tile (String data type)
 #   depth  - # of edges from the root node
+#   fsm_state - State of the move pruning automaton after the moves leading here (int)
 class Node:
-    def __init__(self, state, parent, action, depth):
+    def __init__(self, state, parent, action, depth, fsm_state=0):
         self.state = state      
         self.parent = parent    
         self.action = action
         self.depth = depth
+        self.fsm_state = fsm_state
 
     # __repr__() - Returns string representation of the state
     def __repr__(self):
@@ -99,8 +104,12 @@ class Node:
 
 # class Search - Contains functions related to BFS search
 class Search:
+    # Default Constructor - move_fsm is the duplicate move pruning automaton (see move_pruning.py), built on first use if not given
+    def __init__(self, move_fsm=None):
+        self.move_fsm = move_fsm if move_fsm is not None else get_move_fsm()
 
     # get_children() - This function returns the list of children obtained after simulating the actions on current node
+    #                  Moves that complete a known duplicate sequence (including undoing the parent's move) are never generated.
     def get_children(self, parent_node):
         childrenList = []               # Will store 4 Node objects
         actionList = ["U","D","L","R"]  # Up, Down, Left, Right
@@ -111,19 +120,23 @@ class Search:
         if(xPos == 0): actionList.remove("L")
         if(xPos == 3): actionList.remove("R")
 
+        transitions = self.move_fsm.transitions[parent_node.fsm_state]
         for action in actionList:       # Create a new node for each direction
-            childrenList.append(Node(parent_node.state.execute_action(action), parent_node, action, parent_node.depth + 1))
+            fsmState = transitions[MOVE_INDEX[action]]
+            if fsmState < 0: continue   # Pruned by the automaton
+            childrenList.append(Node(parent_node.state.execute_action(action), parent_node, action, parent_node.depth + 1, fsmState))
         return childrenList
 
     # find_path() - This function backtracks from current node to reach initial configuration. The list of actions would constitute a solution path
-    def find_path(self, node):
+    #               Pass show=False to skip printing the path.
+    def find_path(self, node, show=True):
         currentPath = []
         cur_node = node
         while cur_node:  # Backtrack and record moves
             if(cur_node.action != None): currentPath.append(cur_node.action)
             cur_node = cur_node.parent
         currentPath.reverse()
-        print("Path: ", currentPath)
+        if show: print("Path: ", currentPath)
         return currentPath
 
     # goal_test() - Check if current tiles matches the expected board
@@ -131,29 +144,91 @@ class Search:
         final_tiles = [[1,2,3,4],[5,6,7,8],[9,10,11,12],[13,14,15,0]]
         return cur_tiles == final_tiles
 
-    # run_dls() - Runs a depth limited search for the puzzle solution. 
-    #             Either returns the solution node, 'Cutoff' to run DLS again, or 'Failure' if the solution is not found at any depth.
-    def run_dls(self, root_node, l):
-        expanded_nodes = 0
+    # dls_steps() - Step engine for one depth limited search. Yields Progress snapshots and returns (result, expanded_nodes),
+    #               where result is the solution node, 'Cutoff', 'Failure', or a budget status from search_control.
+    #               expanded_nodes counts on from the value passed in so IDDFS can keep a running total.
+    #               With an endgame table (see endgame_db.py) a board in the table counts as solved if its stored distance
+    #               fits in the limit, and boards outside it stop endgame.depth layers early.
+    #               With a Checkpointer (see checkpoint.py) the DFS stack is saved every interval and when the budget runs out.
+    #               resume is (stack, result) from a checkpoint to continue from instead of the root.
+    def dls_steps(self, root_node, l, budget, expanded_nodes=0, endgame=None, checkpoint=None, resume=None):
         frontier = deque([root_node])  # Will use deque as a LIFO queue.
         result = 'Failure'
+        if resume is not None:
+            frontier, result = deque(resume[0]), resume[1]
+        expandLimit = l if endgame is None else l - endgame.depth
         while len(frontier) != 0:
+            status = budget.check(expanded_nodes)   # Stop early if out of budget or cancelled
+            if status is not None:
+                if checkpoint is not None: self.save_checkpoint(checkpoint, root_node, l, result, expanded_nodes, frontier)
+                return status, expanded_nodes
             currentNode = frontier.pop()
             if self.goal_test(currentNode.state.tiles): # Check if puzzle is solved.
                 return currentNode, expanded_nodes
-            if currentNode.depth > l:
+            if endgame is not None:     # Solved if the stored moves fit within the limit
+                remaining = endgame.distance(currentNode.state.tiles)
+                if remaining is not None and currentNode.depth + remaining <= l + 1:
+                    return currentNode, expanded_nodes
+            if currentNode.depth > expandLimit:
                 result = 'Cutoff'
-            elif not currentNode.is_Cycle():    
+            else:   # Cycles are pruned by the move automaton in get_children()
                 currentChildren = self.get_children(currentNode)    
                 expanded_nodes += 1
                 for child in currentChildren: 
                     frontier.append(child)
+                if checkpoint is not None and checkpoint.due():
+                    self.save_checkpoint(checkpoint, root_node, l, result, expanded_nodes, frontier)
+                if budget.report_due(expanded_nodes):
+                    yield budget.progress(expanded_nodes, l, len(frontier))
         return result, expanded_nodes
-    
+
+    # save_checkpoint() - Saves the depth limit, the DFS stack (with the moves leading to each entry) and the counters
+    def save_checkpoint(self, checkpoint, root_node, l, result, expanded_nodes, frontier):
+        meta = {"kind": "iddfs", "root": rank(root_node.state.tiles), "bound": l, "result": result,
+                "expanded_nodes": expanded_nodes, "fsm_states": len(self.move_fsm.transitions)}
+        checkpoint.save(meta, list(frontier), ["depth", "fsm_state"])
+
+    # run_dls() - Runs a depth limited search for the puzzle solution. 
+    #             Either returns the solution node, 'Cutoff' to run DLS again, or 'Failure' if the solution is not found at any depth.
+    def run_dls(self, root_node, l, endgame=None):
+        return drive(self.dls_steps(root_node, l, Budget(), endgame=endgame))
+
+    # iddfs_steps() - Step engine for iterative deepening. Yields Progress snapshots (bound = current depth limit)
+    #                 and returns an Outcome (solved / budget exhausted / cancelled / unsolvable) instead of calling exit().
+    #                 An existing checkpoint is resumed at the same depth limit, stack position and expansion count.
+    def iddfs_steps(self, root_node, budget=None, endgame=None, checkpoint=None):
+        if budget is None: budget = Budget()
+        budget.start()
+        expanded_nodes = 0      # Total over every depth limit
+        if not is_solvable(root_node.state.tiles):     # Half of all boards can never reach the goal
+            return budget.outcome(UNSOLVABLE, None, expanded_nodes)
+        # -- Start of Iterative Deepening Depth First Search --
+        depth = 0
+        resume = None
+        if checkpoint is not None and checkpoint.exists():     # Resume where the last run stopped
+            meta, stack = checkpoint.load(lambda tiles, parent, action, fields: Node(Board(tiles), parent, action, fields[0], fields[1]))
+            if (meta["kind"] != "iddfs" or meta["root"] != rank(root_node.state.tiles)
+                    or meta["fsm_states"] != len(self.move_fsm.transitions)):
+                raise ValueError("Checkpoint {} belongs to a different search".format(checkpoint.path))
+            depth, expanded_nodes, resume = meta["bound"], meta["expanded_nodes"], (stack, meta["result"])
+        while True:
+            result, expanded_nodes = yield from self.dls_steps(root_node, depth, budget, expanded_nodes, endgame, checkpoint, resume)
+            resume = None
+            if(result in (BUDGET_EXHAUSTED, CANCELLED)):
+                return budget.outcome(result, None, expanded_nodes)
+            if(result == 'Failure'):
+                if checkpoint is not None: checkpoint.clear()
+                return budget.outcome(UNSOLVABLE, None, expanded_nodes)
+            if(result != 'Cutoff'):
+                if checkpoint is not None: checkpoint.clear()
+                path = self.find_path(result, False)
+                if endgame is not None: path += endgame.tail(result.state.tiles)
+                return budget.outcome(SOLVED, path, expanded_nodes)
+            depth += 1
+        # -- End of Iterative Deepening Depth First Search --
+
     # run_iddls() - Uses iterative deepening to repeatedly try to find the solution using DLS with increasing limits.
-    def run_iddfs(self, root_node):
-        solvedPuzzle = 0
-        solutionNode = None
+    def run_iddfs(self, root_node, endgame=None, checkpoint=None):
         # Declare and intialize return variables
         path = []               # list of char
         expanded_nodes = 0      # int
@@ -162,26 +237,18 @@ class Search:
 
         startTime = time.time()                 # Used to calculate time_taken
         process = psutil.Process(os.getpid())   # Used to calculate memory_consumed
-        # -- Start of Iterative Deepening Depth First Search --
-        returnValue = None
-        depth = 0
-        while not solvedPuzzle:
-            result, expanded_nodes = self.run_dls(root_node, depth)
-            if(result != 'Cutoff'):
-                returnValue = result
-                solvedPuzzle = 1
-            depth += 1
-        # -- End of Iterative Deepening Depth First Search --
-        
-        if(returnValue == 'Failure'):
+
+        outcome = drive(self.iddfs_steps(root_node, endgame=endgame, checkpoint=checkpoint))
+        if not outcome.solved():
             print("Could not solve puzzle.")
             exit()
-        solutionNode = returnValue
         
         # Evaluate return variables
         time_taken = "{} ms".format(str((time.time() - startTime)*60))
         memory_consumed = "{} bytes".format(str((process.memory_info().rss)))
-        path = self.find_path(solutionNode)
+        path = outcome.path
+        expanded_nodes = outcome.expanded_nodes
+        print("Path: ", path)
 
         # Return the values
         return path, expanded_nodes, time_taken, memory_consumed
@@ -0,0 +1,102 @@
+##################################################################
+# Instance Generator for 15 Puzzle
+#
+# Description: Streams random solvable boards in the same whitespace separated
+#              format that Search.solve() reads, either uniformly random over all
+#              solvable boards or at an exact optimal distance from the goal.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * Uniform boards: one random number below 16! is decoded into the swaps of a
+#   Fisher-Yates shuffle, whose parity is tracked so solvability is free to check.
+# * Exact depth boards: sampled from the goal rooted breadth first layer at that depth.
+##################################################################
+
+import random
+import sys
+import argparse
+from permutation_rank import FACTORIAL, rank, unrank
+from frontier_search import GOAL, expand_layer
+from search_control import Budget, drive
+
+TILE_STRINGS = [str(tile) for tile in range(16)]
+# BLANK_PARITY[cell] - Parity of the taxicab distance from cell to the blank's goal cell (bottom right)
+BLANK_PARITY = [((3 - cell // 4) + (3 - cell % 4)) & 1 for cell in range(16)]
+
+# format_board() - Returns the board as a line Search.solve() can read, e.g. "1 2 3 ... 15 0"
+def format_board(tiles):
+    return " ".join([TILE_STRINGS[tile] for tile in tiles])
+
+# random_board() - Returns a uniformly random solvable board (flat list)
+def random_board(rng):
+    tiles = GOAL.copy()
+    parity = 0
+    # Each digit of r (in mixed radix 2, 3, ..., 16) is one Fisher-Yates swap, so a single call covers all 16! shuffles
+    r = rng.randrange(FACTORIAL[16])
+    for i in range(15, 0, -1):
+        r, j = divmod(r, i + 1)
+        if j != i:
+            tiles[i], tiles[j] = tiles[j], tiles[i]
+            parity ^= 1
+    blank = tiles.index(0)
+    if parity != BLANK_PARITY[blank]:
+        # Unsolvable: swap the first two tiles that aren't the blank. This pairs every unsolvable board with exactly
+        # one solvable board, so the result stays uniform.
+        first, second = (0, 1) if blank > 1 else (2, 3)
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tiles
+
+# goal_layer() - Returns the ranks of every board exactly depth moves from the goal (goal rooted frontier BFS)
+def goal_layer(depth):
+    layer = {rank(GOAL): 0}
+    for d in range(depth):
+        layer, meet = drive(expand_layer(layer, {}, Budget(), [0], d + 1))     # Nothing to meet, just the next layer
+    return list(layer)
+
+# generate_random() - Streams count uniformly random solvable boards as strings (forever if count is None)
+def generate_random(count=None, seed=None):
+    rng = random.Random(seed)
+    generated = 0
+    while count is None or generated < count:
+        yield format_board(random_board(rng))
+        generated += 1
+
+# generate_at_depth() - Streams count boards whose optimal solution is exactly depth moves (forever if count is None).
+#                       The whole layer is built once (fine up to ~16 moves), then sampled uniformly.
+def generate_at_depth(depth, count=None, seed=None):
+    rng = random.Random(seed)
+    layer = goal_layer(depth)
+    generated = 0
+    while count is None or generated < count:
+        yield format_board(unrank(layer[rng.randrange(len(layer))], 16))
+        generated += 1
+
+# write_boards() - Writes boards to a file object one per line, in chunks to keep the writes cheap
+def write_boards(boards, out, chunk=10000):
+    lines = []
+    for board in boards:
+        lines.append(board)
+        if len(lines) == chunk:
+            out.write("\n".join(lines) + "\n")
+            lines = []
+    if len(lines) != 0:
+        out.write("\n".join(lines) + "\n")
+
+# Generating boards from the command line, e.g. python instance_generator.py --count 1000000 --seed 7 > boards.txt
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate random solvable 15 puzzle boards.")
+    parser.add_argument("--count", type=int, default=10, help="number of boards to generate")
+    parser.add_argument("--depth", type=int, default=None, help="exact optimal solution length (default: uniformly random)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--output", default=None, help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.depth is None:
+        boards = generate_random(args.count, args.seed)
+    else:
+        boards = generate_at_depth(args.depth, args.count, args.seed)
+    if args.output is None:
+        write_boards(boards, sys.stdout)
+    else:
+        with open(args.output, "w") as out:
+            write_boards(boards, out)
@@ -0,0 +1,138 @@
+##################################################################
+# Finite State Machine Move Pruning on 15 Puzzle
+#
+# Description: Builds a duplicate-elimination automaton (Taylor & Korf) so depth
+#              first searches never generate move sequences that are known to reach
+#              the same state as a shorter or earlier sequence (e.g. "UD", or going
+#              half way round a 2x2 block instead of the other half).
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * Duplicates are found by simulating every short move sequence on an unbounded
+#   board, then the forbidden sequences are compiled into an Aho-Corasick automaton.
+##################################################################
+
+# Moves of the empty tile and their (row, column) offsets, in the same order as get_children()
+MOVES = ["U", "D", "L", "R"]
+OFFSETS = {"U": (-1, 0), "D": (1, 0), "L": (0, -1), "R": (0, 1)}
+MOVE_INDEX = {"U": 0, "D": 1, "L": 2, "R": 3}
+DEFAULT_MAX_LENGTH = 8
+
+# class MoveFSM - Automaton over move sequences. transitions[state][MOVE_INDEX[action]] is the next state,
+#                 or -1 if taking that action would complete a duplicate sequence. Start state is 0.
+# Class Variables:
+#   transitions - List of 4-element lists of ints
+#   forbidden - The duplicate move sequences the automaton rejects (list of str)
+class MoveFSM:
+    def __init__(self, transitions, forbidden):
+        self.transitions = transitions
+        self.forbidden = forbidden
+
+    # next_state() - Returns the state after taking action, or -1 if the action is pruned
+    def next_state(self, state, action):
+        return self.transitions[state][MOVE_INDEX[action]]
+
+    # allows() - Returns true if no forbidden sequence occurs in the move sequence
+    def allows(self, moves):
+        state = 0
+        for action in moves:
+            state = self.transitions[state][MOVE_INDEX[action]]
+            if state < 0: return False
+        return True
+
+# find_duplicates() - Returns every minimal move sequence (up to max_length moves) that has an equivalent sequence which is
+#                     shorter, or the same length and earlier in U, D, L, R order, and that stays within its bounding box.
+def find_duplicates(max_length):
+    # Each entry is (moves, blank position, displaced cells, bounding box). Cells map to the cell their tile started in.
+    level = [("", (0, 0), {}, (0, 0, 0, 0))]
+    boxesByEffect = {frozenset(): [(0, 0, 0, 0)]}
+    forbidden = []
+    forbiddenSet = set()
+    for length in range(max_length):
+        nextLevel = []
+        for moves, blank, displaced, box in level:
+            for action in MOVES:
+                # Skip sequences ending in a duplicate already found; only minimal ones are recorded
+                sequence = moves + action
+                if any(sequence[start:] in forbiddenSet for start in range(1, len(sequence) - 1)): continue
+                dy, dx = OFFSETS[action]
+                target = (blank[0] + dy, blank[1] + dx)
+                # Swap the empty tile with the tile at target
+                child = dict(displaced)
+                child[blank], child[target] = displaced.get(target, target), displaced.get(blank, blank)
+                if child[blank] == blank: del child[blank]
+                if child[target] == target: del child[target]
+                childBox = (min(box[0], target[0]), max(box[1], target[0]), min(box[2], target[1]), max(box[3], target[1]))
+                effect = frozenset(child.items())
+                # Duplicate if an earlier sequence with the same effect is legal wherever this one is
+                earlierBoxes = boxesByEffect.setdefault(effect, [])
+                if any(b[0] >= childBox[0] and b[1] <= childBox[1] and b[2] >= childBox[2] and b[3] <= childBox[3]
+                       for b in earlierBoxes):
+                    forbidden.append(sequence)
+                    forbiddenSet.add(sequence)
+                    continue
+                earlierBoxes.append(childBox)
+                nextLevel.append((sequence, target, child, childBox))
+        level = nextLevel
+    return forbidden
+
+# build_fsm() - Compiles the duplicate sequences up to max_length moves into a MoveFSM (Aho-Corasick automaton)
+def build_fsm(max_length=DEFAULT_MAX_LENGTH):
+    forbidden = find_duplicates(max_length)
+    # 1. Build the trie of forbidden sequences
+    children = [[-1, -1, -1, -1]]
+    dead = [False]
+    for moves in forbidden:
+        state = 0
+        for action in moves:
+            m = MOVE_INDEX[action]
+            if children[state][m] < 0:
+                children[state][m] = len(children)
+                children.append([-1, -1, -1, -1])
+                dead.append(False)
+            state = children[state][m]
+        dead[state] = True
+    # 2. Breadth first over the trie to fill in failure links and missing transitions
+    transitions = [[0, 0, 0, 0] for _ in children]
+    failure = [0] * len(children)
+    queue = []
+    for m in range(4):
+        child = children[0][m]
+        if child < 0:
+            transitions[0][m] = 0
+        else:
+            transitions[0][m] = child
+            queue.append(child)
+    head = 0
+    while head < len(queue):
+        state = queue[head]
+        head += 1
+        dead[state] = dead[state] or dead[failure[state]]
+        for m in range(4):
+            child = children[state][m]
+            if child < 0:
+                transitions[state][m] = transitions[failure[state]][m]
+            else:
+                failure[child] = transitions[failure[state]][m]
+                transitions[state][m] = child
+                queue.append(child)
+    # 3. Entering a state that ends a forbidden sequence is pruned
+    for row in transitions:
+        for m in range(4):
+            if dead[row[m]]: row[m] = -1
+    return MoveFSM(transitions, forbidden)
+
+# get_move_fsm() - Returns the default automaton, building it on first use
+_defaultFSM = None
+def get_move_fsm():
+    global _defaultFSM
+    if _defaultFSM is None:
+        _defaultFSM = build_fsm()
+    return _defaultFSM
+
+# Testing the module locally
+if __name__ == '__main__':
+    fsm = build_fsm()
+    print("Forbidden sequences: " + str(len(fsm.forbidden)))
+    print("Automaton states: " + str(len(fsm.transitions)))
+    print("Shortest: " + " ".join(sorted(fsm.forbidden, key=len)[:8]))
@@ -0,0 +1,192 @@
+##################################################################
+# Permutation Ranking for Sliding Puzzles
+#
+# Description: This Python module maps puzzle states to dense integer indices
+#              (and back) so visited tables can be plain bytearrays instead of
+#              sets of Node objects. Works for full boards (any size, e.g. 3x3
+#              or 4x4) and for partial patterns of tiles.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * Ranking is lexicographic, using precomputed factorial / falling factorial
+#   tables and a bitmask of used values, so rank and unrank run in linear time.
+##################################################################
+
+# Precomputed tables, indexed [n][k] = n! / (n-k)! (number of k-permutations of n)
+MAX_CELLS = 16
+FALLING_FACTORIAL = [[1] * (MAX_CELLS + 1) for _ in range(MAX_CELLS + 1)]
+for n in range(MAX_CELLS + 1):
+    for k in range(1, n + 1):
+        FALLING_FACTORIAL[n][k] = FALLING_FACTORIAL[n][k-1] * (n - k + 1)
+FACTORIAL = [FALLING_FACTORIAL[n][n] for n in range(MAX_CELLS + 1)]
+
+# flatten() - Converts a 2D tile list (Board.tiles) into a flat list. Flat lists are returned unchanged.
+def flatten(tiles):
+    if len(tiles) != 0 and isinstance(tiles[0], list):
+        flattenList = []
+        for row in tiles:
+            flattenList.extend(row)
+        return flattenList
+    return tiles
+
+# rank() - Returns the lexicographic index of a permutation of 0..n-1 (0 <= rank < n!)
+def rank(perm):
+    perm = flatten(perm)
+    n = len(perm)
+    used = 0        # Bitmask of values already placed
+    index = 0
+    for i, value in enumerate(perm):
+        # Number of unused values smaller than value = value - (used values smaller than value)
+        smaller = value - (used & ((1 << value) - 1)).bit_count()
+        index += smaller * FACTORIAL[n - 1 - i]
+        used |= 1 << value
+    return index
+
+# unrank() - Returns the permutation of 0..n-1 with the given lexicographic index
+def unrank(index, n):
+    perm = []
+    unused = list(range(n))
+    for i in range(n):
+        position, index = divmod(index, FACTORIAL[n - 1 - i])
+        perm.append(unused.pop(position))
+    return perm
+
+# pattern_positions() - Returns the cell index of each pattern tile in a (flat or 2D) board.
+def pattern_positions(tiles, pattern):
+    tiles = flatten(tiles)
+    where = [0] * len(tiles)
+    for cell, tile in enumerate(tiles):
+        where[tile] = cell
+    return [where[tile] for tile in pattern]
+
+# rank_pattern() - Returns the index of the cells occupied by the pattern tiles (0 <= rank < n!/(n-k)!)
+#                  Tiles not in the pattern are ignored, so many boards share the same pattern rank.
+def rank_pattern(tiles, pattern, n=None):
+    positions = pattern_positions(tiles, pattern)
+    if n is None: n = len(flatten(tiles))
+    k = len(positions)
+    used = 0
+    index = 0
+    for i, cell in enumerate(positions):
+        smaller = cell - (used & ((1 << cell) - 1)).bit_count()
+        index += smaller * FALLING_FACTORIAL[n - 1 - i][k - 1 - i]
+        used |= 1 << cell
+    return index
+
+# unrank_pattern() - Returns the cells of the pattern tiles for the given pattern rank.
+def unrank_pattern(index, k, n):
+    positions = []
+    unused = list(range(n))
+    for i in range(k):
+        position, index = divmod(index, FALLING_FACTORIAL[n - 1 - i][k - 1 - i])
+        positions.append(unused.pop(position))
+    return positions
+
+# pattern_size() - Returns the number of distinct pattern ranks for k tiles on n cells.
+def pattern_size(k, n):
+    return FALLING_FACTORIAL[n][k]
+
+# permutation_parity() - Returns 0 for even and 1 for odd permutations (cycle decomposition, linear time)
+def permutation_parity(perm):
+    perm = flatten(perm)
+    seen = [False] * len(perm)
+    parity = 0
+    for start in range(len(perm)):
+        if seen[start]: continue
+        cycleLength = 0
+        cur = start
+        while not seen[cur]:
+            seen[cur] = True
+            cur = perm[cur]
+            cycleLength += 1
+        parity ^= (cycleLength - 1) & 1
+    return parity
+
+# is_solvable() - Returns true if the board can reach the goal (blank in the bottom right corner).
+#                 Every move swaps the blank with a tile and moves the blank one row or column,
+#                 so permutation parity must match the blank's taxicab distance from its goal cell.
+def is_solvable(tiles, width=4):
+    tiles = flatten(tiles)
+    n = len(tiles)
+    # Express the board as a permutation of cells: tile t belongs in cell t-1, blank in cell n-1
+    perm = [(tile - 1) % n for tile in tiles]
+    blank = tiles.index(0)
+    blankDistance = (width - 1 - blank % width) + ((n // width) - 1 - blank // width)
+    return permutation_parity(perm) == blankDistance & 1
+
+# class BitTable - Visited table with one bit per state, indexed by rank
+# Class Variables:
+#   size - Number of states the table can hold
+#   bits - bytearray storing the bits
+class BitTable:
+    def __init__(self, size):
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+
+    # __contains__() - Returns true if the state index has been marked
+    def __contains__(self, index):
+        return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+    # add() - Marks the state index
+    def add(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    # test_and_add() - Marks the state index, returns true if it was already marked
+    def test_and_add(self, index):
+        byte = index >> 3
+        mask = 1 << (index & 7)
+        if self.bits[byte] & mask:
+            return True
+        self.bits[byte] |= mask
+        return False
+
+# class NibbleTable - Table with one 4-bit value (0-15) per state, indexed by rank. Useful for BFS depths.
+# Class Variables:
+#   size - Number of states the table can hold
+#   empty - Value every entry starts with (15 by default, meaning "not visited")
+#   nibbles - bytearray storing two entries per byte
+class NibbleTable:
+    def __init__(self, size, empty=15):
+        self.size = size
+        self.empty = empty
+        self.nibbles = bytearray([empty | (empty << 4)]) * ((size + 1) >> 1)
+
+    # __getitem__() - Returns the value stored for the state index
+    def __getitem__(self, index):
+        return (self.nibbles[index >> 1] >> ((index & 1) << 2)) & 0xF
+
+    # __setitem__() - Stores a value (0-15) for the state index
+    def __setitem__(self, index, value):
+        shift = (index & 1) << 2
+        byte = index >> 1
+        self.nibbles[byte] = (self.nibbles[byte] & ~(0xF << shift) & 0xFF) | ((value & 0xF) << shift)
+
+    # __contains__() - Returns true if the entry has been set
+    def __contains__(self, index):
+        return self[index] != self.empty
+
+# Testing the module locally
+if __name__ == '__main__':
+    # Exhaustive breadth-first search of the 3x3 puzzle with a bit table (9! bits, ~45 KB)
+    start = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    reached = BitTable(FACTORIAL[9])
+    reached.add(rank(start))
+    layer = [start]
+    depth, total = 0, 1
+    while len(layer) != 0:
+        nextLayer = []
+        for cur in layer:
+            blank = cur.index(0)
+            for target in (blank - 3, blank + 3, blank - 1, blank + 1):
+                if target < 0 or target >= 9: continue
+                if abs(target - blank) == 1 and target // 3 != blank // 3: continue
+                child = cur.copy()
+                child[blank], child[target] = child[target], child[blank]
+                if not reached.test_and_add(rank(child)):
+                    nextLayer.append(child)
+        if len(nextLayer) != 0: depth += 1
+        total += len(nextLayer)
+        layer = nextLayer
+    print("Reachable 3x3 states: " + str(total))
+    print("Maximum depth: " + str(depth))
+    print("Table size (Bytes): " + str(len(reached.bits)))
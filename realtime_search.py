@@ -0,0 +1,144 @@
+##################################################################
+# Real-Time Search on 15 Puzzle - LRTA* with Lookahead
+#
+# Description: An agent that picks the next move within a fixed lookahead depth
+#              and/or time budget instead of planning the whole path first. Every
+#              move it updates the heuristic value of the board it leaves (LRTA*),
+#              and these learned values persist across moves, episodes and, through
+#              save() / load(), across sessions, so repeated runs keep improving.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+# * Uses the same heuristic callables as run_a_star (they take a Node).
+# * Lookahead is iteratively deepened, so a deadline only drops the unfinished depth;
+#   depth 1 (at most 4 heuristic calls) always finishes, which bounds the latency.
+##################################################################
+
+import os
+import time
+import struct
+from array import array
+from permutation_rank import rank, flatten
+from frontier_search import GOAL, MOVES, INVERSE, NEIGHBORS
+import astar_search_manhattan
+
+MAGIC = b"P15L"
+VERSION = 1
+
+# class RealTimeAgent - Learning real-time search agent
+# Class Variables:
+#   heuristic_function - Callable taking a Node (e.g. Search().total_manhattan_distance)
+#   lookahead - Deepest lookahead per move (int)
+#   time_budget - Seconds allowed per move, or None for no deadline (float)
+#   learned - Learned heuristic values by state rank (dict)
+class RealTimeAgent:
+    def __init__(self, heuristic_function=None, lookahead=3, time_budget=None):
+        if heuristic_function is None:
+            heuristic_function = astar_search_manhattan.Search().total_manhattan_distance
+        self.heuristic_function = heuristic_function
+        self.lookahead = lookahead
+        self.time_budget = time_budget
+        self.learned = {}
+
+    # heuristic() - Returns the learned value of a board if there is one, otherwise the heuristic function's value
+    def heuristic(self, tiles):
+        learnedValue = self.learned.get(rank(tiles))
+        if learnedValue is not None:
+            return learnedValue
+        node = astar_search_manhattan.Node(astar_search_manhattan.Board(list(tiles)), None, None, 0, 0)
+        return self.heuristic_function(node)
+
+    # search_value() - Depth limited lookahead. Returns the lowest g + h over the boards depth moves ahead, but never less than
+    #                  the board's own g + h (so learned values raise it), or None if the deadline passed.
+    #                  Branches whose g + h already reaches alpha are cut off.
+    def search_value(self, tiles, depth, g, lastMove, alpha, deadline):
+        if deadline is not None and time.monotonic() >= deadline: return None
+        if tiles == GOAL: return g
+        f = g + self.heuristic(tiles)
+        if depth == 0 or f >= alpha: return f
+        blank = tiles.index(0)
+        best = alpha
+        for m, target in NEIGHBORS[blank]:
+            if lastMove is not None and m == INVERSE[lastMove]: continue    # Don't undo the last move
+            tiles[blank], tiles[target] = tiles[target], 0
+            value = self.search_value(tiles, depth - 1, g + 1, m, best, deadline)
+            tiles[target], tiles[blank] = tiles[blank], 0
+            if value is None: return None
+            best = min(best, value)
+        return max(f, best)
+
+    # next_move() - Returns the next move ("U", "D", "L" or "R") for the board, or None if it is already solved.
+    #               board may be a Board, a 2D tile list or a flat tile list. Updates the learned value of the board.
+    def next_move(self, board):
+        tiles = list(flatten(board.tiles if hasattr(board, "tiles") else board))
+        if tiles == GOAL: return None
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+        blank = tiles.index(0)
+        bestValues = None
+        # Deepen the lookahead one level at a time; depth 1 always completes
+        for depth in range(1, self.lookahead + 1):
+            values = []
+            for m, target in NEIGHBORS[blank]:
+                tiles[blank], tiles[target] = tiles[target], 0
+                value = self.search_value(tiles, depth - 1, 1, m, float("inf"), deadline if depth > 1 else None)
+                tiles[target], tiles[blank] = tiles[blank], 0
+                if value is None: break
+                values.append((value, m))
+            if len(values) != len(NEIGHBORS[blank]): break     # Deadline passed, keep the last complete depth
+            bestValues = values
+        bestValue, bestMove = min(bestValues)
+        # LRTA* update: the board is at least as far from the goal as its best lookahead value
+        stateRank = rank(tiles)
+        self.learned[stateRank] = max(bestValue, self.heuristic(tiles))
+        return MOVES[bestMove]
+
+    # run_episode() - Plays moves from the board until it is solved or max_moves is reached. Returns the list of moves.
+    def run_episode(self, board, max_moves=1000):
+        tiles = list(flatten(board.tiles if hasattr(board, "tiles") else board))
+        path = []
+        while len(path) < max_moves:
+            move = self.next_move(tiles)
+            if move is None: break
+            blank = tiles.index(0)
+            target = [t for m, t in NEIGHBORS[blank] if MOVES[m] == move][0]
+            tiles[blank], tiles[target] = tiles[target], 0
+            path.append(move)
+        return path
+
+    # save() - Writes the learned values to a binary file (written to a temporary file first, then renamed)
+    def save(self, path):
+        ranks = array("Q", self.learned.keys())
+        values = array("H", self.learned.values())
+        tmpPath = path + ".tmp"
+        with open(tmpPath, "wb") as out:
+            out.write(MAGIC + struct.pack("<BI", VERSION, len(ranks)))
+            out.write(ranks.tobytes())
+            out.write(values.tobytes())
+        os.replace(tmpPath, path)
+
+    # load() - Reads learned values written by save(), keeping the larger value where both have one
+    def load(self, path):
+        with open(path, "rb") as f:
+            header = f.read(9)
+            if header[:4] != MAGIC:
+                raise ValueError("{} is not a learned heuristic table".format(path))
+            version, count = struct.unpack("<BI", header[4:])
+            if version != VERSION:
+                raise ValueError("Unsupported learned heuristic table version {}".format(version))
+            ranks = array("Q")
+            ranks.frombytes(f.read(8 * count))
+            values = array("H")
+            values.frombytes(f.read(2 * count))
+        for stateRank, value in zip(ranks, values):
+            if value > self.learned.get(stateRank, 0):
+                self.learned[stateRank] = value
+
+# Testing the agent locally
+if __name__ == '__main__':
+    agent = RealTimeAgent(lookahead=4, time_budget=0.005)
+    board = [int(s) for s in "1 0 2 4 5 7 3 8 9 6 11 12 13 10 14 15".split()]
+    for episode in range(3):
+        startTime = time.time()
+        path = agent.run_episode(board)
+        print("Episode {}: {} moves ({:.1f} ms)".format(episode + 1, len(path), (time.time() - startTime) * 1000))
+        print("Moves: " + " ".join(path))
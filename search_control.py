@@ -0,0 +1,112 @@
+##################################################################
+# Search Control for 15 Puzzle Solvers
+#
+# Description: Shared pieces for running the solvers as resumable step engines.
+#              Each solver exposes a generator (bfs_steps, iddfs_steps, a_star_steps)
+#              that yields Progress snapshots and returns an Outcome, so a caller
+#              can time-slice many searches in one process and stop runaway ones
+#              without exit() killing the host.
+#
+# Course: CS 411, Spring 2024
+# Author: Joshua Hontanosas
+##################################################################
+
+import time
+
+# Outcome statuses
+SOLVED = 'Solved'
+BUDGET_EXHAUSTED = 'Budget Exhausted'
+UNSOLVABLE = 'Unsolvable'
+CANCELLED = 'Cancelled'
+
+# class Progress - Snapshot yielded by a step engine while it is searching.
+# Class Variables:
+#   expanded_nodes - Nodes expanded so far (int)
+#   bound - Current depth limit (IDDFS) or f-score (A*), None for BFS
+#   frontier_size - Number of nodes waiting in the frontier (int)
+#   elapsed - Seconds since the search started (float)
+class Progress:
+    def __init__(self, expanded_nodes, bound, frontier_size, elapsed):
+        self.expanded_nodes = expanded_nodes
+        self.bound = bound
+        self.frontier_size = frontier_size
+        self.elapsed = elapsed
+
+    # __repr__() - Returns string representation of the snapshot
+    def __repr__(self):
+        return "Progress(expanded={}, bound={}, frontier={}, elapsed={:.3f}s)".format(
+            self.expanded_nodes, self.bound, self.frontier_size, self.elapsed)
+
+# class Outcome - Final result returned by a step engine.
+# Class Variables:
+#   status - One of SOLVED, BUDGET_EXHAUSTED, UNSOLVABLE, CANCELLED
+#   path - List of moves when solved, otherwise None
+#   expanded_nodes - Total nodes expanded (int)
+#   elapsed - Seconds the search ran for (float)
+class Outcome:
+    def __init__(self, status, path, expanded_nodes, elapsed):
+        self.status = status
+        self.path = path
+        self.expanded_nodes = expanded_nodes
+        self.elapsed = elapsed
+
+    # solved() - Returns true if a path was found
+    def solved(self):
+        return self.status == SOLVED
+
+    # __repr__() - Returns string representation of the outcome
+    def __repr__(self):
+        return "Outcome({}, path={}, expanded={}, elapsed={:.3f}s)".format(
+            self.status, self.path, self.expanded_nodes, self.elapsed)
+
+# class Budget - Limits and reporting interval for one search. All limits are optional.
+# Class Variables:
+#   max_nodes - Stop after this many expansions (int or None)
+#   max_seconds - Stop after this much wall-clock time (float or None)
+#   cancel_event - Object with is_set() (e.g. threading.Event) for cooperative cancellation, or None
+#   report_every - Yield a Progress snapshot every N expansions (int)
+class Budget:
+    def __init__(self, max_nodes=None, max_seconds=None, cancel_event=None, report_every=1000):
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.cancel_event = cancel_event
+        self.report_every = report_every
+        self.startTime = time.monotonic()
+
+    # start() - Restarts the wall-clock budget
+    def start(self):
+        self.startTime = time.monotonic()
+
+    # elapsed() - Seconds since start()
+    def elapsed(self):
+        return time.monotonic() - self.startTime
+
+    # check() - Returns the status to stop with, or None if the search may continue
+    def check(self, expanded_nodes):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return CANCELLED
+        if self.max_nodes is not None and expanded_nodes >= self.max_nodes:
+            return BUDGET_EXHAUSTED
+        if self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            return BUDGET_EXHAUSTED
+        return None
+
+    # report_due() - Returns true if a Progress snapshot should be yielded after this expansion
+    def report_due(self, expanded_nodes):
+        return expanded_nodes % self.report_every == 0
+
+    # progress() - Builds a Progress snapshot
+    def progress(self, expanded_nodes, bound, frontier_size):
+        return Progress(expanded_nodes, bound, frontier_size, self.elapsed())
+
+    # outcome() - Builds the final Outcome
+    def outcome(self, status, path, expanded_nodes):
+        return Outcome(status, path, expanded_nodes, self.elapsed())
+
+# drive() - Runs a step engine to completion, ignoring progress snapshots, and returns its result.
+def drive(steps):
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value